@@ -1,13 +1,20 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Request, Response, Cookie
 from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.read_preferences import Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest
 import os
+import sys
+import asyncio
 import logging
+import time
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Any
+from collections import OrderedDict
+from pydantic import BaseModel, Field, ConfigDict, BeforeValidator
+from typing import List, Optional, Any, Dict, Union, Iterable, Annotated
 import uuid
 from datetime import datetime, timezone, timedelta
 import httpx
@@ -16,14 +23,145 @@ ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
+# Heavy read-only endpoints can be served by secondaries. Auth and read-after-write
+# paths (board view, card and column reads) always use `db`, i.e. the primary.
+# Against a standalone mongod these settings are ignored; to exercise them locally,
+# start a replica set and add ?replicaSet=<name> to MONGO_URL.
+READ_PREFERENCE_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+# MongoDB requires maxStalenessSeconds to be at least 90; -1 disables the bound
+READ_MAX_STALENESS_SECONDS = int(os.environ.get('READ_MAX_STALENESS_SECONDS', '90'))
+
+def read_preference(mode: str):
+    if mode not in READ_PREFERENCE_MODES:
+        raise ValueError(f"Unknown read preference '{mode}'")
+    if mode == "primary":
+        return Primary()
+    return READ_PREFERENCE_MODES[mode](max_staleness=READ_MAX_STALENESS_SECONDS)
+
+analytics_db = client.get_database(
+    os.environ['DB_NAME'],
+    read_preference=read_preference(os.environ.get('ANALYTICS_READ_PREFERENCE', 'secondaryPreferred'))
+)
+listing_db = client.get_database(
+    os.environ['DB_NAME'],
+    read_preference=read_preference(os.environ.get('LISTING_READ_PREFERENCE', 'secondaryPreferred'))
+)
+
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
 
 EMERGENT_SESSION_API = "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data"
 
+# Sessions slide forward on use, but expires_at is rewritten at most once per
+# refresh interval so busy clients don't turn every read into a write.
+SESSION_TTL = timedelta(days=7)
+SESSION_REFRESH_INTERVAL = timedelta(minutes=int(os.environ.get('SESSION_REFRESH_MINUTES', '60')))
+MAX_SESSIONS_PER_USER = int(os.environ.get('MAX_SESSIONS_PER_USER', '10'))
+SESSION_PURGE_INTERVAL_SECONDS = int(os.environ.get('SESSION_PURGE_INTERVAL_SECONDS', '3600'))
+COUNTER_RECONCILE_INTERVAL_SECONDS = int(os.environ.get('COUNTER_RECONCILE_INTERVAL_SECONDS', '21600'))
+COUNTER_RECONCILE_GRACE_SECONDS = float(os.environ.get('COUNTER_RECONCILE_GRACE_SECONDS', '10'))
+
+INDEXES = {
+    "users": [
+        ([("user_id", 1)], {}),
+        ([("email", 1)], {}),
+    ],
+    "boards": [
+        ([("board_id", 1)], {}),
+    ],
+    "user_sessions": [
+        ([("session_token", 1)], {}),
+        ([("user_id", 1), ("created_at", -1)], {}),
+        ([("expires_at", 1)], {}),
+    ],
+    "columns": [
+        ([("column_id", 1)], {}),
+        ([("board_id", 1), ("order", 1)], {}),
+    ],
+    "cards": [
+        ([("board_id", 1), ("order", 1)], {}),
+        ([("column_id", 1), ("order", 1)], {}),
+        # GET /cards pages by card_id after an equality filter, or by (due_date, card_id)
+        # when a due-date range is given, so every filter combination is one bounded range.
+        # (assigned_to, due_date, ...) also serves the notifications query.
+        ([("assigned_to", 1), ("card_id", 1)], {}),
+        ([("assigned_to", 1), ("due_date", 1), ("card_id", 1)], {}),
+        ([("created_by", 1), ("card_id", 1)], {}),
+        ([("created_by", 1), ("due_date", 1), ("card_id", 1)], {}),
+        ([("board_id", 1), ("card_id", 1)], {}),
+        ([("board_id", 1), ("due_date", 1), ("card_id", 1)], {}),
+        ([("column_id", 1), ("card_id", 1)], {}),
+        ([("column_id", 1), ("due_date", 1), ("card_id", 1)], {}),
+        ([("priority", 1), ("card_id", 1)], {}),
+        ([("priority", 1), ("due_date", 1), ("card_id", 1)], {}),
+        ([("due_date", 1), ("card_id", 1)], {}),
+        ([("card_id", 1)], {}),
+    ],
+    "comments": [
+        ([("comment_id", 1)], {}),
+        ([("card_id", 1), ("created_at", 1)], {}),
+    ],
+    "migrations": [
+        ([("migration_id", 1)], {"unique": True}),
+    ],
+}
+
+# Timestamp fields that used to be stored as ISO strings
+DATETIME_FIELDS = {
+    "users": ["created_at"],
+    "user_sessions": ["created_at", "expires_at"],
+    "boards": ["created_at", "updated_at"],
+    "columns": ["created_at"],
+    "cards": ["created_at", "updated_at", "due_date"],
+    "comments": ["created_at"],
+}
+# Optional fields whose malformed legacy values are cleared rather than left for repair
+NULLABLE_DATETIME_FIELDS = {"due_date"}
+MIGRATION_BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE', '500'))
+
+CARD_QUERY_MAX_LIMIT = 500
+USER_PROFILE_TTL_SECONDS = float(os.environ.get('USER_PROFILE_TTL_SECONDS', '300'))
+USER_PROFILE_CACHE_SIZE = int(os.environ.get('USER_PROFILE_CACHE_SIZE', '5000'))
+# Per-process board model cache; 0 disables it. Writes are only applied to the
+# cache of the worker that handled them, so enable it with a single worker only.
+BOARD_CACHE_MAX_BYTES = int(float(os.environ.get('BOARD_CACHE_MAX_MB', '0')) * 1024 * 1024)
+BOARD_SUMMARY_TTL_SECONDS = float(os.environ.get('BOARD_SUMMARY_TTL_SECONDS', '30'))
+
+background_tasks = []
+board_summary_cache = {"data": None, "expires_at": 0.0, "generation": 0}
+user_profile_cache = {}
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    # Accepts native datetimes and the legacy ISO strings the migration hasn't converted yet
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+def stored_datetime(value: Any) -> Optional[datetime]:
+    # Unparseable legacy strings read as no date rather than failing the whole response
+    try:
+        return to_datetime(value)
+    except ValueError:
+        return None
+
+# Models read documents the datetime migration may not have reached yet, which hold
+# ISO strings, or "" where the old board view posted a card without a due date
+StoredDatetime = Annotated[datetime, BeforeValidator(stored_datetime)]
+OptionalStoredDatetime = Annotated[Optional[datetime], BeforeValidator(stored_datetime)]
+
 class User(BaseModel):
     model_config = ConfigDict(extra="ignore")
     user_id: str
@@ -31,14 +169,14 @@ class User(BaseModel):
     name: str
     picture: Optional[str] = None
     role: str = "user"
-    created_at: str
+    created_at: StoredDatetime
 
 class UserSession(BaseModel):
     model_config = ConfigDict(extra="ignore")
     user_id: str
     session_token: str
-    expires_at: str
-    created_at: str
+    expires_at: StoredDatetime
+    created_at: StoredDatetime
 
 class Board(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -48,8 +186,9 @@ class Board(BaseModel):
     owner_id: str
     collaborators: List[str] = []
     is_template: bool = False
-    created_at: str
-    updated_at: str
+    version: int = 0
+    created_at: StoredDatetime
+    updated_at: StoredDatetime
 
 class Column(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -58,8 +197,10 @@ class Column(BaseModel):
     name: str
     order: int
     wip_limit: Optional[int] = None
+    card_count: int = 0
     color: str = "#64748B"
-    created_at: str
+    version: int = 0
+    created_at: StoredDatetime
 
 class Card(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -69,12 +210,34 @@ class Card(BaseModel):
     title: str
     description: Optional[str] = None
     priority: str = "medium"
-    due_date: Optional[str] = None
+    due_date: OptionalStoredDatetime = None
     assigned_to: Optional[str] = None
     order: int
     created_by: str
-    created_at: str
-    updated_at: str
+    version: int = 0
+    created_at: StoredDatetime
+    updated_at: StoredDatetime
+
+class BoardSummary(Board):
+    card_count: int = 0
+    column_counts: Dict[str, int] = {}
+    overdue_count: int = 0
+    last_activity: OptionalStoredDatetime = None
+
+class UserProfile(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    user_id: str
+    name: str
+    picture: Optional[str] = None
+
+class CardsWithUsers(BaseModel):
+    cards: List[Card]
+    users: Dict[str, UserProfile] = {}
+
+class CardPage(BaseModel):
+    cards: List[Card]
+    next_cursor: Optional[str] = None
+    users: Optional[Dict[str, UserProfile]] = None
 
 class Comment(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -82,7 +245,7 @@ class Comment(BaseModel):
     card_id: str
     user_id: str
     text: str
-    created_at: str
+    created_at: StoredDatetime
 
 class CreateBoardInput(BaseModel):
     name: str
@@ -94,6 +257,9 @@ class CreateColumnInput(BaseModel):
     wip_limit: Optional[int] = None
     color: str = "#64748B"
 
+class UpdateColumnInput(CreateColumnInput):
+    version: Optional[int] = None
+
 class CreateCardInput(BaseModel):
     title: str
     description: Optional[str] = None
@@ -108,10 +274,185 @@ class UpdateCardInput(BaseModel):
     due_date: Optional[str] = None
     assigned_to: Optional[str] = None
     column_id: Optional[str] = None
+    version: Optional[int] = None
+
+class CommentsWithUsers(BaseModel):
+    comments: List[Comment]
+    users: Dict[str, UserProfile] = {}
 
 class AddCommentInput(BaseModel):
     text: str
 
+# Write-through LRU cache of recently active boards. Rows are tuples in model field
+# order; boards are evicted once the approximate size exceeds max_bytes.
+class BoardModelCache:
+    BOARD_FIELDS = tuple(Board.model_fields)
+    COLUMN_FIELDS = tuple(Column.model_fields)
+    CARD_FIELDS = tuple(Card.model_fields)
+    CARD_COLUMN = CARD_FIELDS.index("column_id")
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.boards = OrderedDict()
+        self.loading = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+    
+    @staticmethod
+    def pack(fields: tuple, doc: dict) -> tuple:
+        return tuple(doc.get(field) for field in fields)
+    
+    @staticmethod
+    def unpack(fields: tuple, row: tuple) -> dict:
+        # Missing values fall back to the model defaults, as they would for documents
+        return {field: value for field, value in zip(fields, row) if value is not None}
+    
+    @staticmethod
+    def row_size(row: tuple) -> int:
+        return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    
+    def entry_size(self, entry: dict) -> int:
+        rows = [entry["board"], *entry["columns"].values(), *entry["cards"].values()]
+        return sum(self.row_size(row) for row in rows)
+    
+    def get(self, board_id: str) -> Optional[dict]:
+        entry = self.boards.get(board_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.boards.move_to_end(board_id)
+        return entry
+    
+    def begin_load(self, board_id: str) -> dict:
+        # Concurrent misses await the same load; "valid" is cleared by any write
+        load = {"task": None, "valid": True}
+        self.loading[board_id] = load
+        return load
+    
+    def finish_load(self, board_id: str, load: dict, board: dict, columns: List[dict], cards: List[dict]) -> dict:
+        entry = {
+            "board": self.pack(self.BOARD_FIELDS, board),
+            "columns": {c["column_id"]: self.pack(self.COLUMN_FIELDS, c) for c in columns},
+            "cards": {c["card_id"]: self.pack(self.CARD_FIELDS, c) for c in cards},
+        }
+        if load["valid"]:
+            self.store(board_id, entry)
+        return entry
+    
+    def end_load(self, board_id: str, load: dict):
+        if self.loading.get(board_id) is load:
+            del self.loading[board_id]
+    
+    def invalidate_load(self, board_id: str):
+        # Requests after a write start a fresh load instead of joining the stale one
+        load = self.loading.pop(board_id, None)
+        if load:
+            load["valid"] = False
+    
+    def store(self, board_id: str, entry: dict):
+        self.drop(board_id)
+        entry["size"] = self.entry_size(entry)
+        self.boards[board_id] = entry
+        self.size += entry["size"]
+        self.evict()
+    
+    def evict(self):
+        while self.size > self.max_bytes and self.boards:
+            _, evicted = self.boards.popitem(last=False)
+            self.size -= evicted["size"]
+            self.evictions += 1
+    
+    def drop(self, board_id: str):
+        self.invalidate_load(board_id)
+        entry = self.boards.pop(board_id, None)
+        if entry:
+            self.size -= entry["size"]
+    
+    def update(self, board_id: str, apply):
+        self.invalidate_load(board_id)
+        entry = self.boards.get(board_id)
+        if entry is None:
+            return
+        apply(entry)
+        self.size -= entry["size"]
+        entry["size"] = self.entry_size(entry)
+        self.size += entry["size"]
+        self.evict()
+    
+    def put_board(self, board: dict):
+        def apply(entry):
+            entry["board"] = self.pack(self.BOARD_FIELDS, board)
+        self.update(board["board_id"], apply)
+    
+    def put_column(self, column: dict):
+        def apply(entry):
+            entry["columns"][column["column_id"]] = self.pack(self.COLUMN_FIELDS, column)
+        self.update(column["board_id"], apply)
+    
+    def remove_column(self, board_id: str, column_id: str):
+        def apply(entry):
+            entry["columns"].pop(column_id, None)
+            entry["cards"] = {
+                card_id: row for card_id, row in entry["cards"].items()
+                if row[self.CARD_COLUMN] != column_id
+            }
+        self.update(board_id, apply)
+    
+    def put_card(self, card: dict):
+        def apply(entry):
+            entry["cards"][card["card_id"]] = self.pack(self.CARD_FIELDS, card)
+        self.update(card["board_id"], apply)
+    
+    def remove_card(self, board_id: str, card_id: str):
+        def apply(entry):
+            entry["cards"].pop(card_id, None)
+        self.update(board_id, apply)
+    
+    def board(self, entry: dict) -> dict:
+        return self.unpack(self.BOARD_FIELDS, entry["board"])
+    
+    def columns(self, entry: dict) -> List[dict]:
+        cards_per_column = {}
+        for row in entry["cards"].values():
+            column_id = row[self.CARD_COLUMN]
+            cards_per_column[column_id] = cards_per_column.get(column_id, 0) + 1
+        columns = [self.unpack(self.COLUMN_FIELDS, row) for row in entry["columns"].values()]
+        for column in columns:
+            column["card_count"] = cards_per_column.get(column["column_id"], 0)
+        return sorted(columns, key=lambda c: c["order"])
+    
+    def cards(self, entry: dict) -> List[dict]:
+        cards = [self.unpack(self.CARD_FIELDS, row) for row in entry["cards"].values()]
+        return sorted(cards, key=lambda c: c["order"])
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "boards": len(self.boards),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+board_cache = BoardModelCache(BOARD_CACHE_MAX_BYTES)
+
+def parse_due_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return to_datetime(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid due date")
+
 async def get_current_user(request: Request) -> str:
     session_token = request.cookies.get("session_token")
     if not session_token:
@@ -126,16 +467,392 @@ async def get_current_user(request: Request) -> str:
     if not session_doc:
         raise HTTPException(status_code=401, detail="Invalid session")
     
-    expires_at = session_doc["expires_at"]
-    if isinstance(expires_at, str):
-        expires_at = datetime.fromisoformat(expires_at)
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-    if expires_at < datetime.now(timezone.utc):
+    expires_at = to_datetime(session_doc["expires_at"])
+    now = datetime.now(timezone.utc)
+    if expires_at < now:
         raise HTTPException(status_code=401, detail="Session expired")
     
+    # Sliding expiry: only refresh once the session has aged past the refresh interval.
+    # Filtering on the old expires_at keeps concurrent requests from all writing.
+    if SESSION_TTL - (expires_at - now) >= SESSION_REFRESH_INTERVAL:
+        result = await db.user_sessions.update_one(
+            {"session_token": session_token, "expires_at": session_doc["expires_at"]},
+            {"$set": {"expires_at": now + SESSION_TTL}}
+        )
+        if result.modified_count and request.cookies.get("session_token") == session_token:
+            request.state.refreshed_session_token = session_token
+    
     return session_doc["user_id"]
 
+def expected_version(request: Request, body_version: Optional[int]) -> Optional[int]:
+    if_match = request.headers.get("If-Match")
+    if if_match and if_match.strip() != "*":
+        try:
+            return int(if_match.strip().removeprefix("W/").strip('"'))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid If-Match header")
+    return body_version
+
+def versioned_filter(query: dict, version: Optional[int]) -> dict:
+    # Documents written before versioning have no version field and count as version 0
+    if version is not None:
+        query["version"] = version if version else None
+    return query
+
+async def raise_update_conflict(collection, query: dict, not_found_detail: str):
+    # The conditional update matched nothing: 404 if the document is gone, else 409 with its current state
+    current = await collection.find_one(query, {"_id": 0})
+    if not current:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    raise HTTPException(
+        status_code=409,
+        detail={"message": "Document was modified by someone else", "current": jsonable_encoder(current)}
+    )
+
+def set_session_cookie(response: Response, session_token: str):
+    response.set_cookie(
+        key="session_token",
+        value=session_token,
+        httponly=True,
+        secure=True,
+        samesite="none",
+        path="/",
+        max_age=int(SESSION_TTL.total_seconds())
+    )
+
+async def enforce_session_cap(user_id: str):
+    stale_sessions = await db.user_sessions.find(
+        {"user_id": user_id},
+        {"_id": 0, "session_token": 1}
+    ).sort("created_at", -1).skip(MAX_SESSIONS_PER_USER).to_list(None)
+    if stale_sessions:
+        await db.user_sessions.delete_many(
+            {"session_token": {"$in": [s["session_token"] for s in stale_sessions]}}
+        )
+
+async def purge_expired_sessions() -> int:
+    now = datetime.now(timezone.utc)
+    # The string comparison catches sessions the datetime migration hasn't reached yet
+    result = await db.user_sessions.delete_many(
+        {"$or": [{"expires_at": {"$lt": now}}, {"expires_at": {"$lt": now.isoformat()}}]}
+    )
+    return result.deleted_count
+
+async def reserve_column_slot(column_id: str, board_id: Optional[str] = None) -> dict:
+    # The WIP limit check and the increment are one conditional update
+    query = {"column_id": column_id}
+    if board_id is not None:
+        query["board_id"] = board_id
+    column = await db.columns.find_one_and_update(
+        {
+            **query,
+            "$or": [
+                {"wip_limit": {"$in": [None, 0]}},
+                {"$expr": {"$lt": [{"$ifNull": ["$card_count", 0]}, "$wip_limit"]}}
+            ]
+        },
+        {"$inc": {"card_count": 1}},
+        projection={"_id": 0, "board_id": 1}
+    )
+    if not column:
+        column = await db.columns.find_one(query, {"_id": 0})
+        if not column:
+            raise HTTPException(status_code=404, detail="Column not found")
+        raise HTTPException(
+            status_code=409,
+            detail=f"WIP limit of {column['wip_limit']} reached for '{column['name']}'"
+        )
+    return column
+
+async def release_column_slot(column_id: str):
+    await db.columns.update_one(
+        {"column_id": column_id, "card_count": {"$gt": 0}},
+        {"$inc": {"card_count": -1}}
+    )
+
+async def count_cards_per_column() -> Dict[str, int]:
+    counts = await db.cards.aggregate([
+        {"$group": {"_id": "$column_id", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    return {c["_id"]: c["count"] for c in counts}
+
+async def column_count_mismatches() -> Dict[str, tuple]:
+    # Counters are read before the cards are counted, so a slot reserved by a create
+    # or move that hasn't written its card yet shows up as a mismatch, not a match
+    columns = await db.columns.find({}, {"_id": 0, "column_id": 1, "card_count": 1}).to_list(None)
+    actual = await count_cards_per_column()
+    mismatches = {}
+    for column in columns:
+        count = actual.get(column["column_id"], 0)
+        if column.get("card_count") != count:
+            mismatches[column["column_id"]] = (column.get("card_count"), count)
+    return mismatches
+
+async def reconcile_column_counts() -> int:
+    # A mismatch can be an in-flight create or move; only repair it if it persists
+    suspects = await column_count_mismatches()
+    if not suspects:
+        return 0
+    
+    await asyncio.sleep(COUNTER_RECONCILE_GRACE_SECONDS)
+    current = await column_count_mismatches()
+    repaired = 0
+    for column_id, mismatch in suspects.items():
+        if current.get(column_id) != mismatch:
+            continue
+        card_count, actual = mismatch
+        # Conditional on the counter we read, so a concurrent create or move isn't overwritten
+        result = await db.columns.update_one(
+            {"column_id": column_id, "card_count": card_count},
+            {"$set": {"card_count": actual}}
+        )
+        repaired += result.modified_count
+    return repaired
+
+async def backfill_column_counts():
+    # Columns created before WIP counters have no card_count, which reserve_column_slot
+    # would read as 0; counted once, at startup before requests are served
+    migration_id = "column_card_counts"
+    if await db.migrations.find_one({"migration_id": migration_id, "completed": True}):
+        return
+    
+    actual = await count_cards_per_column()
+    columns = await db.columns.find({"card_count": {"$exists": False}}, {"_id": 0, "column_id": 1}).to_list(None)
+    operations = [
+        UpdateOne(
+            {"column_id": c["column_id"], "card_count": {"$exists": False}},
+            {"$set": {"card_count": actual.get(c["column_id"], 0)}}
+        )
+        for c in columns
+    ]
+    if operations:
+        await db.columns.bulk_write(operations, ordered=False)
+    await db.migrations.update_one(
+        {"migration_id": migration_id},
+        {"$set": {"completed": True, "completed_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    logger.info("Backfilled card_count for %d columns", len(operations))
+
+async def run_periodically(job, interval_seconds: int, description: str):
+    while True:
+        try:
+            affected = await job()
+            if affected:
+                logger.info("%s: %d documents affected", description, affected)
+        except Exception:
+            logger.exception("%s failed", description)
+        await asyncio.sleep(interval_seconds)
+
+def legacy_datetime_update(legacy: dict) -> Optional[dict]:
+    # None when a required timestamp can't be parsed; malformed optional dates are
+    # kept in invalid_<field> and cleared
+    update = {}
+    for field, value in legacy.items():
+        try:
+            update[field] = to_datetime(value)
+        except ValueError:
+            if field not in NULLABLE_DATETIME_FIELDS:
+                return None
+            update[field] = None
+            update[f"invalid_{field}"] = value
+    return update
+
+async def migrate_datetime_fields():
+    # Checkpoints every batch so a restart resumes where it stopped; updates are
+    # conditional on the old string value so concurrent writes win
+    for collection, fields in DATETIME_FIELDS.items():
+        migration_id = f"datetime_fields:{collection}"
+        state = await db.migrations.find_one({"migration_id": migration_id}, {"_id": 0}) or {}
+        if state.get("completed"):
+            continue
+        
+        last_id = state.get("last_id")
+        skipped = state.get("skipped", 0)
+        converted = 0
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id else {}
+            batch = await db[collection].find(
+                query, {field: 1 for field in fields}
+            ).sort("_id", 1).limit(MIGRATION_BATCH_SIZE).to_list(MIGRATION_BATCH_SIZE)
+            if not batch:
+                break
+            
+            operations = []
+            batch_skipped = 0
+            for doc in batch:
+                legacy = {f: doc[f] for f in fields if isinstance(doc.get(f), str)}
+                if not legacy:
+                    continue
+                update = legacy_datetime_update(legacy)
+                if update is None:
+                    logger.warning("Skipping %s document %s with a malformed timestamp", collection, doc["_id"])
+                    batch_skipped += 1
+                    continue
+                operations.append(UpdateOne(
+                    {"_id": doc["_id"], **legacy},
+                    {"$set": update}
+                ))
+            if operations:
+                result = await db[collection].bulk_write(operations, ordered=False)
+                converted += result.modified_count
+            
+            last_id = batch[-1]["_id"]
+            skipped += batch_skipped
+            await db.migrations.update_one(
+                {"migration_id": migration_id},
+                {"$set": {"last_id": last_id}, "$inc": {"skipped": batch_skipped}},
+                upsert=True
+            )
+        
+        if skipped:
+            # Not done: rescan the collection on the next startup once the documents are repaired
+            await db.migrations.update_one(
+                {"migration_id": migration_id},
+                {"$unset": {"last_id": "", "skipped": ""}}
+            )
+            logger.warning(
+                "Datetime migration for %s skipped %d documents with malformed timestamps; "
+                "it will rescan the collection on next startup", collection, skipped
+            )
+            continue
+        
+        await db.migrations.update_one(
+            {"migration_id": migration_id},
+            {"$set": {"completed": True, "completed_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        logger.info("Datetime migration finished for %s (%d documents converted)", collection, converted)
+
+async def run_datetime_migration():
+    try:
+        await migrate_datetime_fields()
+    except Exception:
+        logger.exception("Datetime migration failed; it will resume on next startup")
+
+async def resolve_user_profiles(user_ids: Iterable[Optional[str]]) -> Dict[str, dict]:
+    now = time.monotonic()
+    profiles = {}
+    missing = []
+    for user_id in set(filter(None, user_ids)):
+        cached = user_profile_cache.get(user_id)
+        if cached and cached[1] > now:
+            profiles[user_id] = cached[0]
+        else:
+            missing.append(user_id)
+    
+    if missing:
+        users = await db.users.find(
+            {"user_id": {"$in": missing}},
+            {"_id": 0, "user_id": 1, "name": 1, "picture": 1}
+        ).to_list(None)
+        for user in users:
+            if len(user_profile_cache) >= USER_PROFILE_CACHE_SIZE:
+                user_profile_cache.pop(next(iter(user_profile_cache)))
+            user_profile_cache[user["user_id"]] = (user, now + USER_PROFILE_TTL_SECONDS)
+            profiles[user["user_id"]] = user
+    return profiles
+
+def invalidate_user_profile(user_id: str):
+    user_profile_cache.pop(user_id, None)
+
+async def card_users(cards: List[dict]) -> Dict[str, dict]:
+    return await resolve_user_profiles(
+        user_id for card in cards for user_id in (card.get("assigned_to"), card.get("created_by"))
+    )
+
+async def fetch_board_documents(board_id: str):
+    return await asyncio.gather(
+        db.boards.find_one({"board_id": board_id}, {"_id": 0}),
+        db.columns.find({"board_id": board_id}, {"_id": 0}).to_list(None),
+        db.cards.find({"board_id": board_id}, {"_id": 0}).to_list(None)
+    )
+
+async def load_board_model(board_id: str, load: dict) -> Optional[dict]:
+    try:
+        board, columns, cards = await fetch_board_documents(board_id)
+        if not board:
+            return None
+        return board_cache.finish_load(board_id, load, board, columns, cards)
+    finally:
+        board_cache.end_load(board_id, load)
+
+async def get_board_model(board_id: str) -> Optional[dict]:
+    entry = board_cache.get(board_id)
+    if entry is not None:
+        return entry
+    
+    # The board view fetches the board, columns and cards in parallel; one load serves all three
+    load = board_cache.loading.get(board_id)
+    if load is None:
+        load = board_cache.begin_load(board_id)
+        load["task"] = asyncio.ensure_future(load_board_model(board_id, load))
+    # Shielded so one caller disconnecting doesn't cancel the load for the others
+    return await asyncio.shield(load["task"])
+
+def invalidate_board_summary():
+    board_summary_cache["data"] = None
+    board_summary_cache["generation"] += 1
+
+async def build_board_summaries() -> List[dict]:
+    now = datetime.now(timezone.utc)
+    pipeline = [
+        {"$group": {
+            "_id": {"board_id": "$board_id", "column_id": "$column_id"},
+            "count": {"$sum": 1},
+            "overdue": {"$sum": {"$cond": [
+                {"$or": [
+                    {"$and": [{"$eq": [{"$type": "$due_date"}, "date"]}, {"$lt": ["$due_date", now]}]},
+                    # Legacy string due dates the datetime migration hasn't converted yet
+                    {"$and": [
+                        {"$eq": [{"$type": "$due_date"}, "string"]},
+                        {"$ne": ["$due_date", ""]},
+                        {"$lt": ["$due_date", now.isoformat()]}
+                    ]}
+                ]},
+                1,
+                0
+            ]}},
+            "last_activity": {"$max": "$updated_at"}
+        }},
+        {"$group": {
+            "_id": "$_id.board_id",
+            "column_counts": {"$push": {"k": "$_id.column_id", "v": "$count"}},
+            "card_count": {"$sum": "$count"},
+            "overdue_count": {"$sum": "$overdue"},
+            "last_activity": {"$max": "$last_activity"}
+        }},
+        {"$project": {
+            "card_count": 1,
+            "overdue_count": 1,
+            "last_activity": 1,
+            "column_counts": {"$arrayToObject": "$column_counts"}
+        }}
+    ]
+    boards, stats = await asyncio.gather(
+        db.boards.find({}, {"_id": 0}).to_list(None),
+        db.cards.aggregate(pipeline).to_list(None)
+    )
+    stats_by_board = {s["_id"]: s for s in stats}
+    
+    summaries = []
+    for board in boards:
+        board_stats = stats_by_board.get(board["board_id"], {})
+        activity = [to_datetime(board.get("updated_at")), to_datetime(board_stats.get("last_activity"))]
+        summaries.append({
+            **board,
+            "card_count": board_stats.get("card_count", 0),
+            "column_counts": board_stats.get("column_counts", {}),
+            "overdue_count": board_stats.get("overdue_count", 0),
+            "last_activity": max((a for a in activity if a), default=None)
+        })
+    return summaries
+
+async def ensure_indexes():
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            await db[collection].create_index(keys, **options)
+
 @api_router.get("/")
 async def root():
     return {"message": "TGP Bioplastics Kanban API", "status": "running"}
@@ -161,6 +878,7 @@ async def create_session(request: Request, response: Response):
             {"user_id": user_id},
             {"$set": {"name": data["name"], "picture": data.get("picture")}}
         )
+        invalidate_user_profile(user_id)
     else:
         # Check if this is the first user
         user_count = await db.users.count_documents({})
@@ -174,29 +892,23 @@ async def create_session(request: Request, response: Response):
             "picture": data.get("picture"),
             "role": "admin" if is_first_user else "user",
             "approved": True if is_first_user else False,
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "created_at": datetime.now(timezone.utc)
         }
         await db.users.insert_one(user_doc)
     
     session_token = data["session_token"]
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
-    session_doc = {
-        "user_id": user_id,
-        "session_token": session_token,
-        "expires_at": expires_at.isoformat(),
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.user_sessions.insert_one(session_doc)
-    
-    response.set_cookie(
-        key="session_token",
-        value=session_token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        path="/",
-        max_age=7*24*60*60
+    now = datetime.now(timezone.utc)
+    await db.user_sessions.update_one(
+        {"session_token": session_token},
+        {
+            "$set": {"user_id": user_id, "expires_at": now + SESSION_TTL},
+            "$setOnInsert": {"created_at": now}
+        },
+        upsert=True
     )
+    await enforce_session_cap(user_id)
+    
+    set_session_cookie(response, session_token)
     
     user = await db.users.find_one({"user_id": user_id}, {"_id": 0})
     return user
@@ -221,14 +933,29 @@ async def logout(request: Request, response: Response):
 async def get_boards(request: Request):
     user_id = await get_current_user(request)
     # Return all boards for organization-wide collaboration
-    boards = await db.boards.find({}, {"_id": 0}).to_list(1000)
+    boards = await listing_db.boards.find({}, {"_id": 0}).to_list(1000)
     return boards
 
+@api_router.get("/boards/summary", response_model=List[BoardSummary])
+async def get_board_summaries(request: Request):
+    await get_current_user(request)
+    # Cached briefly and invalidated by board, column and card writes
+    if board_summary_cache["data"] is not None and board_summary_cache["expires_at"] >= time.monotonic():
+        return board_summary_cache["data"]
+    
+    generation = board_summary_cache["generation"]
+    summaries = await build_board_summaries()
+    # A write during the build invalidated it; serve it but don't cache it
+    if board_summary_cache["generation"] == generation:
+        board_summary_cache["data"] = summaries
+        board_summary_cache["expires_at"] = time.monotonic() + BOARD_SUMMARY_TTL_SECONDS
+    return summaries
+
 @api_router.post("/boards", response_model=Board)
 async def create_board(input: CreateBoardInput, request: Request):
     user_id = await get_current_user(request)
     board_id = f"board_{uuid.uuid4().hex[:12]}"
-    now = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc)
     
     board_doc = {
         "board_id": board_id,
@@ -237,6 +964,7 @@ async def create_board(input: CreateBoardInput, request: Request):
         "owner_id": user_id,
         "collaborators": [],
         "is_template": input.is_template,
+        "version": 1,
         "created_at": now,
         "updated_at": now
     }
@@ -257,22 +985,30 @@ async def create_board(input: CreateBoardInput, request: Request):
             "name": col["name"],
             "order": col["order"],
             "wip_limit": col["wip_limit"],
+            "card_count": 0,
             "color": col["color"],
+            "version": 1,
             "created_at": now
         }
         await db.columns.insert_one(column_doc)
     
+    invalidate_board_summary()
     board = await db.boards.find_one({"board_id": board_id}, {"_id": 0})
     return board
 
 class UpdateBoardInput(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
+    version: Optional[int] = None
 
 @api_router.get("/boards/{board_id}", response_model=Board)
 async def get_board(board_id: str, request: Request):
     user_id = await get_current_user(request)
-    board = await db.boards.find_one({"board_id": board_id}, {"_id": 0})
+    if board_cache.enabled:
+        model = await get_board_model(board_id)
+        board = board_cache.board(model) if model else None
+    else:
+        board = await db.boards.find_one({"board_id": board_id}, {"_id": 0})
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
     
@@ -282,19 +1018,26 @@ async def get_board(board_id: str, request: Request):
 @api_router.put("/boards/{board_id}")
 async def update_board(board_id: str, input: UpdateBoardInput, request: Request):
     user_id = await get_current_user(request)
-    board = await db.boards.find_one({"board_id": board_id}, {"_id": 0})
-    if not board:
-        raise HTTPException(status_code=404, detail="Board not found")
+    version = expected_version(request, input.version)
     
     # Allow all users to update board (organization-wide collaboration)
-    update_data = {"updated_at": datetime.now(timezone.utc).isoformat()}
+    update_data = {"updated_at": datetime.now(timezone.utc)}
     if input.name is not None:
         update_data["name"] = input.name
     if input.description is not None:
         update_data["description"] = input.description
     
-    await db.boards.update_one({"board_id": board_id}, {"$set": update_data})
-    return {"message": "Board updated"}
+    board = await db.boards.find_one_and_update(
+        versioned_filter({"board_id": board_id}, version),
+        {"$set": update_data, "$inc": {"version": 1}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not board:
+        await raise_update_conflict(db.boards, {"board_id": board_id}, "Board not found")
+    board_cache.put_board(board)
+    invalidate_board_summary()
+    return {"message": "Board updated", "version": board["version"]}
 
 @api_router.delete("/boards/{board_id}")
 async def delete_board(board_id: str, request: Request):
@@ -308,11 +1051,17 @@ async def delete_board(board_id: str, request: Request):
     await db.boards.delete_one({"board_id": board_id})
     await db.columns.delete_many({"board_id": board_id})
     await db.cards.delete_many({"board_id": board_id})
+    board_cache.drop(board_id)
+    invalidate_board_summary()
     return {"message": "Board deleted"}
 
 @api_router.get("/boards/{board_id}/columns", response_model=List[Column])
 async def get_columns(board_id: str, request: Request):
     await get_current_user(request)
+    if board_cache.enabled:
+        model = await get_board_model(board_id)
+        if model:
+            return board_cache.columns(model)
     columns = await db.columns.find({"board_id": board_id}, {"_id": 0}).sort("order", 1).to_list(1000)
     return columns
 
@@ -335,6 +1084,7 @@ async def create_column(board_id: str, input: CreateColumnInput, request: Reques
             {"column_id": questions_column["column_id"]},
             {"$set": {"order": order + 1}}
         )
+        board_cache.put_column({**questions_column, "order": order + 1})
     else:
         # No Questions column, add at end
         max_order = await db.columns.find({"board_id": board_id}).sort("order", -1).limit(1).to_list(1)
@@ -346,26 +1096,35 @@ async def create_column(board_id: str, input: CreateColumnInput, request: Reques
         "name": input.name,
         "order": order,
         "wip_limit": input.wip_limit,
+        "card_count": 0,
         "color": input.color,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "version": 1,
+        "created_at": datetime.now(timezone.utc)
     }
     await db.columns.insert_one(column_doc)
     column = await db.columns.find_one({"column_id": column_doc["column_id"]}, {"_id": 0})
+    board_cache.put_column(column)
     return column
 
 @api_router.put("/columns/{column_id}")
-async def update_column(column_id: str, input: CreateColumnInput, request: Request):
+async def update_column(column_id: str, input: UpdateColumnInput, request: Request):
     user_id = await get_current_user(request)
-    column = await db.columns.find_one({"column_id": column_id}, {"_id": 0})
-    if not column:
-        raise HTTPException(status_code=404, detail="Column not found")
+    version = expected_version(request, input.version)
     
     # Allow all users to update columns (organization-wide collaboration)
-    await db.columns.update_one(
-        {"column_id": column_id},
-        {"$set": {"name": input.name, "wip_limit": input.wip_limit, "color": input.color}}
+    column = await db.columns.find_one_and_update(
+        versioned_filter({"column_id": column_id}, version),
+        {
+            "$set": {"name": input.name, "wip_limit": input.wip_limit, "color": input.color},
+            "$inc": {"version": 1}
+        },
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    return {"message": "Column updated"}
+    if not column:
+        await raise_update_conflict(db.columns, {"column_id": column_id}, "Column not found")
+    board_cache.put_column(column)
+    return {"message": "Column updated", "version": column["version"]}
 
 @api_router.delete("/columns/{column_id}")
 async def delete_column(column_id: str, request: Request):
@@ -377,22 +1136,104 @@ async def delete_column(column_id: str, request: Request):
     # Allow all users to delete columns (organization-wide collaboration)
     await db.columns.delete_one({"column_id": column_id})
     await db.cards.delete_many({"column_id": column_id})
+    board_cache.remove_column(column["board_id"], column_id)
+    invalidate_board_summary()
     return {"message": "Column deleted"}
 
-@api_router.get("/boards/{board_id}/cards", response_model=List[Card])
-async def get_cards(board_id: str, request: Request):
+@api_router.get("/boards/{board_id}/cards", response_model=Union[List[Card], CardsWithUsers])
+async def get_cards(board_id: str, request: Request, include_users: bool = False):
     await get_current_user(request)
-    cards = await db.cards.find({"board_id": board_id}, {"_id": 0}).sort("order", 1).to_list(1000)
+    model = await get_board_model(board_id) if board_cache.enabled else None
+    if model:
+        cards = board_cache.cards(model)
+    else:
+        cards = await db.cards.find({"board_id": board_id}, {"_id": 0}).sort("order", 1).to_list(1000)
+    if include_users:
+        return {"cards": cards, "users": await card_users(cards)}
     return cards
 
+@api_router.get("/cards", response_model=CardPage)
+async def query_cards(
+    request: Request,
+    board_id: Optional[str] = None,
+    column_id: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    created_by: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_after: Optional[str] = None,
+    due_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    include_users: bool = False
+):
+    user_id = await get_current_user(request)
+    
+    # "me" resolves to the caller and assigned_to=none selects unassigned cards
+    if assigned_to == "me":
+        assigned_to = user_id
+    if created_by == "me":
+        created_by = user_id
+    
+    query = {}
+    filters = {
+        "board_id": board_id,
+        "column_id": column_id,
+        "assigned_to": assigned_to,
+        "created_by": created_by,
+        "priority": priority
+    }
+    for field, value in filters.items():
+        if value is not None:
+            query[field] = value
+    if assigned_to == "none":
+        query["assigned_to"] = None
+    
+    due_range = {}
+    if due_after:
+        due_range["$gte"] = parse_due_date(due_after)
+    if due_before:
+        due_range["$lt"] = parse_due_date(due_before)
+    
+    limit = max(1, min(limit, CARD_QUERY_MAX_LIMIT))
+    if due_range:
+        # Page through the range itself in (due_date, card_id) order; the cursor is
+        # "<due_date>|<card_id>" of the last card returned
+        query["due_date"] = due_range
+        sort = [("due_date", 1), ("card_id", 1)]
+        if cursor:
+            cursor_due, _, cursor_card = cursor.partition("|")
+            cursor_due = parse_due_date(cursor_due)
+            if not cursor_due or not cursor_card:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = {"$and": [query, {"$or": [
+                {"due_date": {"$gt": cursor_due}},
+                {"due_date": cursor_due, "card_id": {"$gt": cursor_card}}
+            ]}]}
+    else:
+        sort = [("card_id", 1)]
+        if cursor:
+            query["card_id"] = {"$gt": cursor}
+    
+    cards = await db.cards.find(query, {"_id": 0}).sort(sort).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(cards) > limit:
+        last = cards[limit - 1]
+        next_cursor = f"{to_datetime(last['due_date']).isoformat()}|{last['card_id']}" if due_range else last["card_id"]
+    page = {"cards": cards[:limit], "next_cursor": next_cursor}
+    if include_users:
+        page["users"] = await card_users(page["cards"])
+    return page
+
 @api_router.post("/boards/{board_id}/columns/{column_id}/cards", response_model=Card)
 async def create_card(board_id: str, column_id: str, input: CreateCardInput, request: Request):
     user_id = await get_current_user(request)
+    due_date = parse_due_date(input.due_date)
+    await reserve_column_slot(column_id, board_id)
     
     max_order = await db.cards.find({"column_id": column_id}).sort("order", -1).limit(1).to_list(1)
     order = max_order[0]["order"] + 1 if max_order else 0
     
-    now = datetime.now(timezone.utc).isoformat()
+    now = datetime.now(timezone.utc)
     card_doc = {
         "card_id": f"card_{uuid.uuid4().hex[:12]}",
         "board_id": board_id,
@@ -400,42 +1241,93 @@ async def create_card(board_id: str, column_id: str, input: CreateCardInput, req
         "title": input.title,
         "description": input.description,
         "priority": input.priority,
-        "due_date": input.due_date,
+        "due_date": due_date,
         "assigned_to": input.assigned_to,
         "order": order,
         "created_by": user_id,
+        "version": 1,
         "created_at": now,
         "updated_at": now
     }
-    await db.cards.insert_one(card_doc)
+    try:
+        await db.cards.insert_one(card_doc)
+    except Exception:
+        await release_column_slot(column_id)
+        raise
+    invalidate_board_summary()
     card = await db.cards.find_one({"card_id": card_doc["card_id"]}, {"_id": 0})
+    board_cache.put_card(card)
     return card
 
 @api_router.put("/cards/{card_id}", response_model=Card)
 async def update_card(card_id: str, input: UpdateCardInput, request: Request):
     await get_current_user(request)
-    card = await db.cards.find_one({"card_id": card_id}, {"_id": 0})
-    if not card:
-        raise HTTPException(status_code=404, detail="Card not found")
+    version = expected_version(request, input.version)
     
-    update_data = {k: v for k, v in input.model_dump().items() if v is not None}
-    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    update_data = {k: v for k, v in input.model_dump(exclude={"version"}).items() if v is not None}
+    if "due_date" in update_data:
+        update_data["due_date"] = parse_due_date(update_data["due_date"])
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    query = versioned_filter({"card_id": card_id}, version)
     
-    await db.cards.update_one({"card_id": card_id}, {"$set": update_data})
-    updated_card = await db.cards.find_one({"card_id": card_id}, {"_id": 0})
+    # Moves don't read the card first: reserve a slot in the destination, then give back
+    # the slot of whichever column the update says the card was in. That is the
+    # destination itself when the card didn't actually move.
+    destination = None
+    wip_rejection = None
+    if input.column_id is not None:
+        try:
+            destination = await reserve_column_slot(input.column_id)
+            query["board_id"] = destination["board_id"]
+        except HTTPException as e:
+            if e.status_code != 409:
+                raise
+            # A full column still accepts updates to cards that are already in it
+            wip_rejection = e
+            query["column_id"] = input.column_id
+    
+    card = await db.cards.find_one_and_update(
+        query,
+        {"$set": update_data, "$inc": {"version": 1}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not card:
+        if destination:
+            await release_column_slot(input.column_id)
+        if input.column_id is not None:
+            current = await db.cards.find_one({"card_id": card_id}, {"_id": 0, "board_id": 1, "column_id": 1})
+            if current and wip_rejection and current["column_id"] != input.column_id:
+                raise wip_rejection
+            if current and destination and current["board_id"] != destination["board_id"]:
+                raise HTTPException(status_code=404, detail="Column not found")
+        await raise_update_conflict(db.cards, {"card_id": card_id}, "Card not found")
+    if destination:
+        await release_column_slot(card["column_id"])
+    
+    updated_card = {**card, **update_data, "version": card.get("version", 0) + 1}
+    board_cache.put_card(updated_card)
+    invalidate_board_summary()
     return updated_card
 
 @api_router.delete("/cards/{card_id}")
 async def delete_card(card_id: str, request: Request):
     await get_current_user(request)
-    await db.cards.delete_one({"card_id": card_id})
+    card = await db.cards.find_one_and_delete({"card_id": card_id}, {"_id": 0, "board_id": 1, "column_id": 1})
+    if card:
+        await release_column_slot(card["column_id"])
+        board_cache.remove_card(card["board_id"], card_id)
+        invalidate_board_summary()
     await db.comments.delete_many({"card_id": card_id})
     return {"message": "Card deleted"}
 
-@api_router.get("/cards/{card_id}/comments", response_model=List[Comment])
-async def get_comments(card_id: str, request: Request):
+@api_router.get("/cards/{card_id}/comments", response_model=Union[List[Comment], CommentsWithUsers])
+async def get_comments(card_id: str, request: Request, include_users: bool = False):
     await get_current_user(request)
     comments = await db.comments.find({"card_id": card_id}, {"_id": 0}).sort("created_at", 1).to_list(1000)
+    if include_users:
+        users = await resolve_user_profiles(comment["user_id"] for comment in comments)
+        return {"comments": comments, "users": users}
     return comments
 
 @api_router.post("/cards/{card_id}/comments", response_model=Comment)
@@ -446,7 +1338,7 @@ async def add_comment(card_id: str, input: AddCommentInput, request: Request):
         "card_id": card_id,
         "user_id": user_id,
         "text": input.text,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     await db.comments.insert_one(comment_doc)
     comment = await db.comments.find_one({"comment_id": comment_doc["comment_id"]}, {"_id": 0})
@@ -459,7 +1351,7 @@ async def get_all_users(request: Request):
     if user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     
-    users = await db.users.find({}, {"_id": 0}).to_list(1000)
+    users = await listing_db.users.find({}, {"_id": 0}).to_list(1000)
     return users
 
 @api_router.put("/admin/users/{target_user_id}/role")
@@ -491,9 +1383,20 @@ async def reject_user(target_user_id: str, request: Request):
     
     # Delete user and their sessions
     await db.users.delete_one({"user_id": target_user_id})
+    invalidate_user_profile(target_user_id)
     await db.user_sessions.delete_many({"user_id": target_user_id})
     return {"message": "User rejected"}
 
+@api_router.delete("/admin/users/{target_user_id}/sessions")
+async def revoke_user_sessions(target_user_id: str, request: Request):
+    user_id = await get_current_user(request)
+    user = await db.users.find_one({"user_id": user_id}, {"_id": 0})
+    if user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    result = await db.user_sessions.delete_many({"user_id": target_user_id})
+    return {"message": "Sessions revoked", "revoked": result.deleted_count}
+
 @api_router.get("/admin/analytics")
 async def get_analytics(request: Request):
     user_id = await get_current_user(request)
@@ -501,9 +1404,9 @@ async def get_analytics(request: Request):
     if user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
     
-    total_users = await db.users.count_documents({})
-    total_boards = await db.boards.count_documents({})
-    total_cards = await db.cards.count_documents({})
+    total_users = await analytics_db.users.count_documents({})
+    total_boards = await analytics_db.boards.count_documents({})
+    total_cards = await analytics_db.cards.count_documents({})
     
     return {
         "total_users": total_users,
@@ -511,23 +1414,40 @@ async def get_analytics(request: Request):
         "total_cards": total_cards
     }
 
+@api_router.get("/admin/cache/stats")
+async def get_cache_stats(request: Request):
+    user_id = await get_current_user(request)
+    user = await db.users.find_one({"user_id": user_id}, {"_id": 0})
+    if user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin only")
+    
+    return {
+        "board_cache": board_cache.stats(),
+        "user_profile_cache": {"entries": len(user_profile_cache)}
+    }
+
 @api_router.get("/notifications")
 async def get_notifications(request: Request):
     user_id = await get_current_user(request)
     now = datetime.now(timezone.utc)
     
-    assigned_cards = await db.cards.find(
-        {"assigned_to": user_id, "due_date": {"$ne": None}},
+    # Only cards due within the notification window; string due dates are
+    # legacy documents the datetime migration hasn't converted yet.
+    assigned_cards = await listing_db.cards.find(
+        {
+            "assigned_to": user_id,
+            "$or": [
+                {"due_date": {"$lt": now + timedelta(days=8)}},
+                {"due_date": {"$type": "string"}}
+            ]
+        },
         {"_id": 0}
     ).to_list(1000)
     
     notifications = []
     for card in assigned_cards:
-        if card.get("due_date"):
-            due_date = datetime.fromisoformat(card["due_date"])
-            if due_date.tzinfo is None:
-                due_date = due_date.replace(tzinfo=timezone.utc)
-            
+        due_date = stored_datetime(card.get("due_date"))
+        if due_date:
             days_until = (due_date - now).days
             if days_until <= 0:
                 notifications.append({
@@ -555,6 +1475,14 @@ async def get_notifications(request: Request):
 
 app.include_router(api_router)
 
+@app.middleware("http")
+async def refresh_session_cookie(request: Request, call_next):
+    response = await call_next(request)
+    session_token = getattr(request.state, "refreshed_session_token", None)
+    if session_token:
+        set_session_cookie(response, session_token)
+    return response
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -569,6 +1497,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_background_tasks():
+    await ensure_indexes()
+    try:
+        await backfill_column_counts()
+    except Exception:
+        logger.exception("Column counter backfill failed; it will retry on next startup")
+    background_tasks.append(asyncio.create_task(
+        run_periodically(purge_expired_sessions, SESSION_PURGE_INTERVAL_SECONDS, "Expired session purge")
+    ))
+    background_tasks.append(asyncio.create_task(
+        run_periodically(reconcile_column_counts, COUNTER_RECONCILE_INTERVAL_SECONDS, "Column counter reconciliation")
+    ))
+    background_tasks.append(asyncio.create_task(run_datetime_migration()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
     client.close()
\ No newline at end of file
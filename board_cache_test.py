@@ -0,0 +1,162 @@
+import os
+import sys
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+# server.py reads these at import time; the cache tests never touch Mongo
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "board_cache_test")
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+import server  # noqa: E402
+from server import BoardModelCache  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+
+def make_board(board_id):
+    return {"board_id": board_id, "name": board_id, "owner_id": "user_1", "created_at": NOW, "updated_at": NOW}
+
+def make_column(board_id, column_id, order):
+    return {"column_id": column_id, "board_id": board_id, "name": column_id, "order": order, "created_at": NOW}
+
+def make_card(board_id, column_id, card_id, order=0):
+    return {
+        "card_id": card_id,
+        "board_id": board_id,
+        "column_id": column_id,
+        "title": card_id,
+        "order": order,
+        "created_by": "user_1",
+        "created_at": NOW,
+        "updated_at": NOW
+    }
+
+def load(cache, board_id, columns=(), cards=()):
+    pending = cache.begin_load(board_id)
+    entry = cache.finish_load(board_id, pending, make_board(board_id), list(columns), list(cards))
+    cache.end_load(board_id, pending)
+    return entry
+
+def test_write_during_load_skips_store():
+    cache = BoardModelCache(10**6)
+    pending = cache.begin_load("b1")
+    cache.put_card(make_card("b1", "c1", "k1"))
+    entry = cache.finish_load("b1", pending, make_board("b1"), [make_column("b1", "c1", 0)], [])
+    
+    assert "b1" not in cache.boards
+    assert cache.columns(entry)[0]["column_id"] == "c1"
+    assert cache.loading == {}
+
+def test_drop_during_load_skips_store():
+    cache = BoardModelCache(10**6)
+    pending = cache.begin_load("b1")
+    cache.drop("b1")
+    cache.finish_load("b1", pending, make_board("b1"), [], [])
+    
+    assert "b1" not in cache.boards
+
+def test_load_started_after_a_write_is_not_joined_to_the_stale_one():
+    cache = BoardModelCache(10**6)
+    stale = cache.begin_load("b1")
+    cache.put_board(make_board("b1"))
+    fresh = cache.begin_load("b1")
+    cache.finish_load("b1", stale, make_board("b1"), [], [])
+    cache.end_load("b1", stale)
+    
+    assert "b1" not in cache.boards
+    assert cache.loading == {"b1": fresh}
+    cache.finish_load("b1", fresh, make_board("b1"), [], [])
+    assert "b1" in cache.boards
+
+def test_evicts_least_recently_used_within_budget():
+    probe = BoardModelCache(10**6)
+    load(probe, "probe")
+    board_size = probe.size
+    
+    cache = BoardModelCache(board_size * 2)
+    load(cache, "b1")
+    load(cache, "b2")
+    cache.get("b1")
+    load(cache, "b3")
+    
+    assert list(cache.boards) == ["b1", "b3"]
+    assert cache.evictions == 1
+    assert cache.size <= cache.max_bytes
+
+def test_growing_board_is_evicted_when_over_budget():
+    probe = BoardModelCache(10**6)
+    load(probe, "probe")
+    
+    cache = BoardModelCache(probe.size + 50)
+    load(cache, "b1")
+    cache.put_card(make_card("b1", "c1", "k1"))
+    
+    assert "b1" not in cache.boards
+    assert cache.size == 0
+    assert cache.evictions == 1
+
+def test_remove_column_drops_its_cards():
+    cache = BoardModelCache(10**6)
+    entry = load(
+        cache,
+        "b1",
+        [make_column("b1", "c1", 0), make_column("b1", "c2", 1)],
+        [make_card("b1", "c1", "k1"), make_card("b1", "c2", "k2"), make_card("b1", "c2", "k3")]
+    )
+    cache.remove_column("b1", "c2")
+    
+    assert [c["column_id"] for c in cache.columns(entry)] == ["c1"]
+    assert [c["card_id"] for c in cache.cards(entry)] == ["k1"]
+
+def test_columns_derive_card_count_from_cached_cards():
+    cache = BoardModelCache(10**6)
+    stale = {**make_column("b1", "c1", 0), "card_count": 7}
+    entry = load(
+        cache,
+        "b1",
+        [make_column("b1", "c2", 1), stale],
+        [make_card("b1", "c1", "k1"), make_card("b1", "c1", "k2")]
+    )
+    cache.put_card(make_card("b1", "c2", "k2"))
+    
+    counts = {c["column_id"]: c["card_count"] for c in cache.columns(entry)}
+    assert counts == {"c1": 1, "c2": 1}
+    assert [c["column_id"] for c in cache.columns(entry)] == ["c1", "c2"]
+
+def fake_fetch(calls, fail=False):
+    async def fetch_board_documents(board_id):
+        calls.append(board_id)
+        await asyncio.sleep(0.01)
+        if fail:
+            raise RuntimeError("database unavailable")
+        return make_board(board_id), [make_column(board_id, "c1", 0)], [make_card(board_id, "c1", "k1")]
+    return fetch_board_documents
+
+def test_concurrent_misses_share_one_load(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server, "board_cache", BoardModelCache(10**6))
+    monkeypatch.setattr(server, "fetch_board_documents", fake_fetch(calls))
+    
+    async def open_board():
+        return await asyncio.gather(*(server.get_board_model("b1") for _ in range(3)))
+    models = asyncio.run(open_board())
+    
+    assert calls == ["b1"]
+    assert models[0] is models[1] is models[2]
+    assert "b1" in server.board_cache.boards
+    assert server.board_cache.loading == {}
+
+def test_failed_load_reaches_every_caller_and_clears_the_marker(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server, "board_cache", BoardModelCache(10**6))
+    monkeypatch.setattr(server, "fetch_board_documents", fake_fetch(calls, fail=True))
+    
+    async def open_board():
+        return await asyncio.gather(
+            *(server.get_board_model("b1") for _ in range(2)), return_exceptions=True
+        )
+    results = asyncio.run(open_board())
+    
+    assert calls == ["b1"]
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert server.board_cache.loading == {}
@@ -25,6 +25,7 @@ export default function BoardView() {
   const [board, setBoard] = useState(null);
   const [columns, setColumns] = useState([]);
   const [cards, setCards] = useState([]);
+  const [users, setUsers] = useState({});
   const [loading, setLoading] = useState(true);
   const [showAddCard, setShowAddCard] = useState(null);
   const [showCardDetail, setShowCardDetail] = useState(null);
@@ -59,11 +60,12 @@ export default function BoardView() {
       const [boardRes, columnsRes, cardsRes] = await Promise.all([
         axios.get(`${BACKEND_URL}/api/boards/${boardId}`, { withCredentials: true }),
         axios.get(`${BACKEND_URL}/api/boards/${boardId}/columns`, { withCredentials: true }),
-        axios.get(`${BACKEND_URL}/api/boards/${boardId}/cards`, { withCredentials: true })
+        axios.get(`${BACKEND_URL}/api/boards/${boardId}/cards?include_users=true`, { withCredentials: true })
       ]);
       setBoard(boardRes.data);
       setColumns(columnsRes.data);
-      setCards(cardsRes.data);
+      setCards(cardsRes.data.cards);
+      setUsers(cardsRes.data.users);
     } catch (error) {
       console.error("Failed to fetch board:", error);
       toast.error("Failed to load board");
@@ -90,7 +92,7 @@ export default function BoardView() {
       fetchBoardData();
     } catch (error) {
       console.error("Failed to create card:", error);
-      toast.error("Failed to create card");
+      toast.error(error.response?.status === 409 ? error.response.data.detail : "Failed to create card");
     }
   };
 
@@ -205,10 +207,10 @@ export default function BoardView() {
       setNewAnswer("");
       // Fetch updated comments
       const comments = await axios.get(
-        `${BACKEND_URL}/api/cards/${questionCard.card_id}/comments`,
+        `${BACKEND_URL}/api/cards/${questionCard.card_id}/comments?include_users=true`,
         { withCredentials: true }
       );
-      setShowAnswerDialog({ ...questionCard, comments: comments.data });
+      setShowAnswerDialog({ ...questionCard, comments: comments.data.comments, users: comments.data.users });
     } catch (error) {
       console.error("Failed to post answer:", error);
       toast.error("Failed to post answer");
@@ -218,10 +220,10 @@ export default function BoardView() {
   const openAnswerDialog = async (questionCard) => {
     try {
       const comments = await axios.get(
-        `${BACKEND_URL}/api/cards/${questionCard.card_id}/comments`,
+        `${BACKEND_URL}/api/cards/${questionCard.card_id}/comments?include_users=true`,
         { withCredentials: true }
       );
-      setShowAnswerDialog({ ...questionCard, comments: comments.data });
+      setShowAnswerDialog({ ...questionCard, comments: comments.data.comments, users: comments.data.users });
     } catch (error) {
       console.error("Failed to fetch answers:", error);
       setShowAnswerDialog({ ...questionCard, comments: [] });
@@ -248,7 +250,8 @@ export default function BoardView() {
           title: showEditCard.title,
           description: showEditCard.description,
           priority: showEditCard.priority,
-          due_date: showEditCard.due_date || null
+          due_date: showEditCard.due_date || null,
+          version: showEditCard.version
         },
         { withCredentials: true }
       );
@@ -257,6 +260,12 @@ export default function BoardView() {
       fetchBoardData();
     } catch (error) {
       console.error("Failed to update card:", error);
+      if (error.response?.status === 409) {
+        toast.error("Card was changed by someone else, please review and try again");
+        setShowEditCard(null);
+        fetchBoardData();
+        return;
+      }
       toast.error("Failed to update card");
     }
   };
@@ -345,17 +354,25 @@ export default function BoardView() {
 
     // Then update backend silently - DO NOT refetch to avoid visual glitch
     try {
-      await axios.put(
+      const res = await axios.put(
         `${BACKEND_URL}/api/cards/${draggableId}`,
-        { column_id: destination.droppableId },
+        { column_id: destination.droppableId, version: movedCard.version },
         { withCredentials: true }
       );
-      // Success - no need to refetch, optimistic update is already correct
+      // Success - no need to refetch, just pick up the new version
+      setCards(prev => prev.map(card => card.card_id === draggableId ? res.data : card));
     } catch (error) {
       console.error("Failed to move card:", error);
+      const current = error.response?.status === 409 && error.response.data.detail?.current;
+      if (current) {
+        // Someone else changed the card first - adopt their version instead of refetching the board
+        setCards(prev => prev.map(card => card.card_id === current.card_id ? current : card));
+        toast.error("Card was changed by someone else");
+        return;
+      }
       // Revert on error by refetching
       fetchBoardData();
-      toast.error("Failed to move card");
+      toast.error(error.response?.status === 409 ? error.response.data.detail : "Failed to move card");
     }
   };
 
@@ -595,6 +612,7 @@ export default function BoardView() {
                                     {card.assigned_to && (
                                       <div className="flex items-center gap-1">
                                         <UserIcon className="w-3 h-3" />
+                                        {users[card.assigned_to] && <span>{users[card.assigned_to].name}</span>}
                                       </div>
                                     )}
                                   </div>
@@ -1028,6 +1046,7 @@ export default function BoardView() {
                           <div className="flex-1">
                             <p className="text-sm text-[#1E293B]">{comment.text}</p>
                             <p className="text-xs text-[#64748B] mt-1">
+                              {showAnswerDialog.users?.[comment.user_id] && `${showAnswerDialog.users[comment.user_id].name} · `}
                               {new Date(comment.created_at).toLocaleDateString()} at {new Date(comment.created_at).toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'})}
                             </p>
                           </div>
@@ -35,7 +35,7 @@ export default function Dashboard() {
     try {
       const [userRes, boardsRes, notifRes] = await Promise.all([
         axios.get(`${BACKEND_URL}/api/auth/me`, { withCredentials: true }),
-        axios.get(`${BACKEND_URL}/api/boards`, { withCredentials: true }),
+        axios.get(`${BACKEND_URL}/api/boards/summary`, { withCredentials: true }),
         axios.get(`${BACKEND_URL}/api/notifications`, { withCredentials: true })
       ]);
       setUser(userRes.data);
@@ -330,6 +330,15 @@ export default function Dashboard() {
                     {board.description}
                   </p>
                 )}
+                <div className="flex items-center gap-3 text-xs text-[#64748B] mb-3" data-testid={`board-stats-${idx}`}>
+                  <span>{board.card_count} {board.card_count === 1 ? "card" : "cards"}</span>
+                  {board.overdue_count > 0 && (
+                    <span className="text-[#EF4444] font-medium">{board.overdue_count} overdue</span>
+                  )}
+                  {board.last_activity && (
+                    <span>Updated {new Date(board.last_activity).toLocaleDateString()}</span>
+                  )}
+                </div>
                 <div className="flex items-center justify-between text-xs text-[#64748B]">
                   <div className="flex items-center gap-2">
                     <User className="w-4 h-4" />